@@ -1,5 +1,6 @@
 from fastapi import FastAPI, UploadFile, File, Form, Body
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import os
 import datetime
 
@@ -10,6 +11,7 @@ from core.risk_engine import calculate_risk_score
 from core.ipcheck import check_abuseipdb
 from core.fileupload import parse_log_file
 from core.analyze_all import batch_analyze  # <-- Batch analyzer
+from core.batch_record import iter_results_json
 
 TOR_EXIT_IPS = fetch_tor_exit_ips()
 
@@ -158,7 +160,7 @@ async def upload_logs(file: UploadFile = File(...)):
 async def analyze_batch_api(payload: dict = Body(...)):
     ip_entries = payload.get("ip_entries", [])
     results = batch_analyze(ip_entries)
-    return {"results": results}
+    return StreamingResponse(iter_results_json(results), media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,136 @@
+"""
+Compares peak RSS and wall-clock time of serving batch results as nested
+dicts through JSONResponse (the old /analyze_batch path) versus BatchRecord
+objects streamed through StreamingResponse(iter_results_json(...)).
+Responses are sent to an in-process ASGI send() that discards the body.
+
+Usage (from backend/): python -m benchmarks.bench_batch_memory [N]
+"""
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from core.batch_record import BatchRecord, iter_results_json
+from core.risk_engine import calculate_risk_score
+
+GEO_POOL = [
+    ({"country": "India", "city": "Chennai", "lat": 13.08, "lon": 80.27, "flag": "🇮🇳"},
+     {"provider": "Bharti Airtel", "asn": "9498"}),
+    ({"country": "United States", "city": "Ashburn", "lat": 39.04, "lon": -77.49, "flag": "🇺🇸"},
+     {"provider": "Amazon.com, Inc.", "asn": "14618"}),
+    ({"country": "Germany", "city": "Frankfurt", "lat": 50.11, "lon": 8.68, "flag": ""},
+     {"provider": "Hetzner Online GmbH", "asn": "24940"}),
+    ({"country": "Unknown", "city": "Unknown", "lat": 0.0, "lon": 0.0, "flag": ""},
+     {"provider": "Unknown ISP", "asn": "Unknown"}),
+]
+
+
+def make_record(i):
+    abuse_score = i % 101
+    is_tor = i % 17 == 0
+    vpn_detected = i % 23 == 0
+    proxy_detected = i % 29 == 0
+    blocklist_hit = abuse_score >= 70
+    risk_result = calculate_risk_score(
+        abuse_score=abuse_score,
+        blocklist_hit=blocklist_hit,
+        tor_exit=is_tor,
+        vpn_detected=vpn_detected,
+        proxy_detected=proxy_detected,
+    )
+    # Copy so every entry owns its enrichment dicts, as lookup_ip does.
+    geo_data, isp_data = (dict(d) for d in GEO_POOL[i % len(GEO_POOL)])
+    return BatchRecord(
+        ip=f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}",
+        port=str(1024 + i % 60000),
+        timestamp="2025-01-01 12:00:00",
+        incident_type="Brute Force",
+        risk_result=risk_result,
+        abuse_score=abuse_score,
+        is_tor=is_tor,
+        vpn_detected=vpn_detected,
+        proxy_detected=proxy_detected,
+        blocklist_hit=blocklist_hit,
+        geo_data=geo_data,
+        isp_data=isp_data,
+    )
+
+
+def build_records(n):
+    return [make_record(i) for i in range(n)]
+
+
+def serve(response):
+    """
+    Runs response against a client that never disconnects and drops the body.
+    Returns the number of body bytes sent.
+    """
+    sent = 0
+
+    async def receive():
+        # An immediate http.disconnect would make StreamingResponse stop early.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal sent
+        sent += len(message.get("body", b""))
+
+    scope = {"type": "http", "method": "POST", "path": "/analyze_batch", "headers": []}
+    asyncio.run(response(scope, receive, send))
+    return sent
+
+
+def run_mode(mode, n):
+    start = time.perf_counter()
+    if mode == "dict":
+        # Build one at a time so only the dict form is ever held in bulk.
+        results = [make_record(i).to_dict() for i in range(n)]
+        sent = serve(JSONResponse({"results": results}))
+    elif mode == "edge":
+        results = build_records(n)
+        sent = serve(StreamingResponse(iter_results_json(results), media_type="application/json"))
+    else:
+        results = build_records(n)
+        sent = 0
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # ru_maxrss is in bytes on macOS and KiB on Linux.
+        peak_kb //= 1024
+    print(f"{peak_kb} {elapsed:.3f} {sent}")
+
+
+def measure(mode, n):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--mode", mode, str(n)],
+        capture_output=True, text=True, check=True,
+    )
+    peak_kb, elapsed, sent = out.stdout.split()
+    return int(peak_kb), float(elapsed), int(sent)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "--mode":
+        run_mode(args[1], int(args[2]))
+        sys.exit(0)
+
+    n = int(args[0]) if args else 200000
+    dict_kb, dict_s, dict_bytes = measure("dict", n)
+    record_kb, record_s, _ = measure("record", n)
+    edge_kb, edge_s, edge_bytes = measure("edge", n)
+    if dict_bytes != edge_bytes:
+        sys.exit(f"Body size mismatch: JSONResponse {dict_bytes} B vs streamed {edge_bytes} B")
+    print(f"Entries: {n}")
+    print(f"Nested dicts + JSONResponse:        {dict_kb / 1024:.1f} MiB peak, {dict_s:.2f} s")
+    print(f"BatchRecord only:                   {record_kb / 1024:.1f} MiB peak, {record_s:.2f} s")
+    print(f"BatchRecord + StreamingResponse:    {edge_kb / 1024:.1f} MiB peak, {edge_s:.2f} s")
+    print(f"Body size (both): {edge_bytes} bytes")
+    print(f"Peak RSS reduction at the API edge: {100 * (1 - edge_kb / dict_kb):.1f}%")
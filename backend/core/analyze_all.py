@@ -2,12 +2,17 @@ from core.geoip import lookup_ip
 from core.tor_collector import fetch_tor_exit_ips
 from core.risk_engine import calculate_risk_score
 from core.ipcheck import check_abuseipdb
+from core.batch_record import BatchRecord
 import datetime
 
 TOR_EXIT_IPS = fetch_tor_exit_ips()
 
 
 def batch_analyze(ip_entries):
+    """
+    Analyzes each entry and returns a list of BatchRecord objects.
+    Call to_dict() on each record to get the API response shape.
+    """
     results = []
     for entry in ip_entries:
         ip = entry.get("ip") or ""
@@ -51,43 +56,20 @@ def batch_analyze(ip_entries):
             port_activity=port_activity,
             history_score=history_score,
         )
-        risk_level = risk_result["level"]
-        risk_score = risk_result["score"]
-        risk_distribution = {
-            "Low": int(risk_level == "Low"),
-            "Medium": int(risk_level == "Medium"),
-            "High": int(risk_level == "High"),
-        }
-        factor_scores = [
-            {"label": "AbuseIPDB Score", "value": abuse_score},
-            {"label": "TOR", "value": int(is_tor) * 80},
-            {"label": "VPN", "value": int(vpn_detected) * 80},
-            {"label": "Proxy", "value": int(proxy_detected) * 80},
-            {"label": "Blocklists", "value": 40 if blocklist_hit else 0},
-            {"label": "Geolocation", "value": 20 if geo_data.get("country", "") != "Unknown" else 0},
-            {"label": "Port Activity", "value": port_activity},
-            {"label": "History", "value": history_score},
-        ]
-        results.append({
-            "ip": ip,
-            "port": port,
-            "timestamp": timestamp,
-            "incident_type": incident_type,
-            "risk_level": risk_level,
-            "classification": {
-                "TOR": bool(is_tor),
-                "VPN": bool(vpn_detected),
-                "Proxy": bool(proxy_detected),
-            },
-            "geolocation": geo_data,
-            "isp": isp_data,
-            "factor_scores": factor_scores,
-            "risk_distribution": risk_distribution,
-            "notes": "Risk computed using threat enrichment and AbuseIPDB (ML is disabled).",
-            "risk_explanation": risk_result.get("factors", []),
-            "scores": {
-                "abuse_score": float(abuse_score),
-                "risk_engine_score": float(risk_score),
-            }
-        })
+        results.append(BatchRecord(
+            ip=ip,
+            port=port,
+            timestamp=timestamp,
+            incident_type=incident_type,
+            risk_result=risk_result,
+            abuse_score=abuse_score,
+            is_tor=is_tor,
+            vpn_detected=vpn_detected,
+            proxy_detected=proxy_detected,
+            blocklist_hit=blocklist_hit,
+            geo_data=geo_data,
+            isp_data=isp_data,
+            port_activity=port_activity,
+            history_score=history_score,
+        ))
     return results
@@ -0,0 +1,119 @@
+import json
+import sys
+
+NOTES = "Risk computed using threat enrichment and AbuseIPDB (ML is disabled)."
+
+
+def _intern(value):
+    # Categorical fields (risk level, country, ASN, ...) repeat across a batch,
+    # so share one string object per distinct value.
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class BatchRecord:
+    """
+    Compact result for a single batch entry.
+    Holds only flat fields; the nested API shape is rebuilt by to_dict().
+    """
+    __slots__ = (
+        "ip", "port", "timestamp", "incident_type", "risk_level",
+        "is_tor", "vpn_detected", "proxy_detected", "blocklist_hit",
+        "country", "city", "lat", "lon", "flag", "provider", "asn",
+        "abuse_score", "risk_score", "port_activity", "history_score",
+        "risk_explanation",
+    )
+
+    def __init__(self, ip, port, timestamp, incident_type, risk_result,
+                 abuse_score, is_tor, vpn_detected, proxy_detected,
+                 blocklist_hit, geo_data, isp_data,
+                 port_activity=0, history_score=0):
+        self.ip = ip
+        self.port = port
+        self.timestamp = timestamp
+        self.incident_type = _intern(incident_type)
+        self.risk_level = _intern(risk_result["level"])
+        self.is_tor = bool(is_tor)
+        self.vpn_detected = bool(vpn_detected)
+        self.proxy_detected = bool(proxy_detected)
+        self.blocklist_hit = bool(blocklist_hit)
+        # Keys mirror core/geoip.py:lookup_ip; to_dict() rebuilds geolocation
+        # and isp from these fields, so keep both in sync with lookup_ip.
+        self.country = _intern(geo_data.get("country", "Unknown"))
+        self.city = _intern(geo_data.get("city", "Unknown"))
+        self.lat = geo_data.get("lat", 0.0)
+        self.lon = geo_data.get("lon", 0.0)
+        self.flag = _intern(geo_data.get("flag", ""))
+        self.provider = _intern(isp_data.get("provider", "Unknown ISP"))
+        self.asn = _intern(isp_data.get("asn", "Unknown"))
+        self.abuse_score = abuse_score
+        self.risk_score = risk_result["score"]
+        self.port_activity = port_activity
+        self.history_score = history_score
+        self.risk_explanation = tuple(_intern(f) for f in risk_result.get("factors", []))
+
+    def to_dict(self):
+        """
+        Returns the JSON shape served by /analyze_batch.
+        """
+        return {
+            "ip": self.ip,
+            "port": self.port,
+            "timestamp": self.timestamp,
+            "incident_type": self.incident_type,
+            "risk_level": self.risk_level,
+            "classification": {
+                "TOR": self.is_tor,
+                "VPN": self.vpn_detected,
+                "Proxy": self.proxy_detected,
+            },
+            "geolocation": {
+                "country": self.country,
+                "city": self.city,
+                "lat": self.lat,
+                "lon": self.lon,
+                "flag": self.flag,
+            },
+            "isp": {
+                "provider": self.provider,
+                "asn": self.asn,
+            },
+            "factor_scores": [
+                {"label": "AbuseIPDB Score", "value": self.abuse_score},
+                {"label": "TOR", "value": int(self.is_tor) * 80},
+                {"label": "VPN", "value": int(self.vpn_detected) * 80},
+                {"label": "Proxy", "value": int(self.proxy_detected) * 80},
+                {"label": "Blocklists", "value": 40 if self.blocklist_hit else 0},
+                {"label": "Geolocation", "value": 20 if self.country != "Unknown" else 0},
+                {"label": "Port Activity", "value": self.port_activity},
+                {"label": "History", "value": self.history_score},
+            ],
+            "risk_distribution": {
+                "Low": int(self.risk_level == "Low"),
+                "Medium": int(self.risk_level == "Medium"),
+                "High": int(self.risk_level == "High"),
+            },
+            "notes": NOTES,
+            "risk_explanation": list(self.risk_explanation),
+            "scores": {
+                "abuse_score": float(self.abuse_score),
+                "risk_engine_score": float(self.risk_score),
+            }
+        }
+
+
+def iter_results_json(records, chunk_size=1000):
+    """
+    Yields the {"results": [...]} JSON body in chunks of chunk_size records,
+    so the nested dicts are never all held in memory together.
+    Output is compact, matching what JSONResponse would send.
+    """
+    parts = ['{"results":[']
+    for i, record in enumerate(records):
+        if i:
+            parts.append(",")
+        parts.append(json.dumps(record.to_dict(), ensure_ascii=False, separators=(",", ":")))
+        if (i + 1) % chunk_size == 0:
+            yield "".join(parts)
+            parts = []
+    parts.append("]}")
+    yield "".join(parts)
@@ -0,0 +1,154 @@
+import importlib
+
+import pytest
+
+import core.tor_collector
+from core.batch_record import BatchRecord
+from core.risk_engine import calculate_risk_score
+
+TOR_IP = "185.220.101.1"
+
+ABUSE_RESULTS = {
+    TOR_IP: {"abuseConfidenceScore": 100, "domain": "torproject.org", "hostnames": []},
+    "203.0.113.5": {"abuseConfidenceScore": 45, "domain": "examplevpn.net", "hostnames": ["node.vpn.example"]},
+    "198.51.100.7": {"abuseConfidenceScore": 75, "domain": None, "hostnames": ["open-proxy.example"]},
+    "192.0.2.9": {"abuseConfidenceScore": 0, "domain": "", "hostnames": []},
+}
+
+GEO_RESULTS = {
+    TOR_IP: ({"country": "Germany", "city": "Frankfurt", "lat": 50.11, "lon": 8.68, "flag": ""},
+             {"provider": "Tor Relay Host", "asn": "60729"}),
+    "203.0.113.5": ({"country": "India", "city": "Chennai", "lat": 13.08, "lon": 80.27, "flag": "🇮🇳"},
+                    {"provider": "Bharti Airtel", "asn": "9498"}),
+    "198.51.100.7": ({"country": "United States", "city": "Ashburn", "lat": 39.04, "lon": -77.49, "flag": "🇺🇸"},
+                     {"provider": "Amazon.com, Inc.", "asn": "14618"}),
+    "192.0.2.9": ({"country": "Unknown", "city": "Unknown", "lat": 0.0, "lon": 0.0, "flag": ""},
+                  {"provider": "Unknown ISP", "asn": "Unknown"}),
+}
+
+ENTRIES = [
+    {"ip": TOR_IP, "port": "443", "timestamp": "2025-01-01 03:15:00", "incidentType": "Brute Force"},
+    {"ip": "203.0.113.5", "port": "3389", "timestamp": "2025-01-01 12:00:00", "incidentType": "Port Scan"},
+    {"ip": "198.51.100.7", "port": "8080", "timestamp": "bad-timestamp", "incidentType": "Brute Force"},
+    {"ip": "192.0.2.9", "port": None, "timestamp": None, "incidentType": None},
+]
+
+
+def lookup_ip(ip):
+    geo, isp = GEO_RESULTS[ip]
+    return dict(geo), dict(isp)
+
+
+def check_abuseipdb(ip):
+    return dict(ABUSE_RESULTS[ip])
+
+
+def legacy_result(ip, port, timestamp, incident_type, abuse_score, is_tor, vpn_detected,
+                  proxy_detected, geo_data, isp_data, port_activity=0, history_score=0):
+    # The dict batch_analyze built inline before BatchRecord was introduced.
+    blocklist_hit = abuse_score >= 70
+    risk_result = calculate_risk_score(
+        abuse_score=abuse_score,
+        blocklist_hit=blocklist_hit,
+        tor_exit=is_tor,
+        vpn_detected=vpn_detected,
+        proxy_detected=proxy_detected,
+        port_activity=port_activity,
+        history_score=history_score,
+    )
+    risk_level = risk_result["level"]
+    risk_score = risk_result["score"]
+    risk_distribution = {
+        "Low": int(risk_level == "Low"),
+        "Medium": int(risk_level == "Medium"),
+        "High": int(risk_level == "High"),
+    }
+    factor_scores = [
+        {"label": "AbuseIPDB Score", "value": abuse_score},
+        {"label": "TOR", "value": int(is_tor) * 80},
+        {"label": "VPN", "value": int(vpn_detected) * 80},
+        {"label": "Proxy", "value": int(proxy_detected) * 80},
+        {"label": "Blocklists", "value": 40 if blocklist_hit else 0},
+        {"label": "Geolocation", "value": 20 if geo_data.get("country", "") != "Unknown" else 0},
+        {"label": "Port Activity", "value": port_activity},
+        {"label": "History", "value": history_score},
+    ]
+    return {
+        "ip": ip,
+        "port": port,
+        "timestamp": timestamp,
+        "incident_type": incident_type,
+        "risk_level": risk_level,
+        "classification": {
+            "TOR": bool(is_tor),
+            "VPN": bool(vpn_detected),
+            "Proxy": bool(proxy_detected),
+        },
+        "geolocation": geo_data,
+        "isp": isp_data,
+        "factor_scores": factor_scores,
+        "risk_distribution": risk_distribution,
+        "notes": "Risk computed using threat enrichment and AbuseIPDB (ML is disabled).",
+        "risk_explanation": risk_result.get("factors", []),
+        "scores": {
+            "abuse_score": float(abuse_score),
+            "risk_engine_score": float(risk_score),
+        }
+    }
+
+
+@pytest.fixture
+def analyze_all(monkeypatch):
+    # analyze_all fetches TOR exit IPs at import time; keep that off the network.
+    monkeypatch.setattr(core.tor_collector, "fetch_tor_exit_ips", lambda *args, **kwargs: set())
+    module = importlib.import_module("core.analyze_all")
+    monkeypatch.setattr(module, "TOR_EXIT_IPS", {TOR_IP})
+    monkeypatch.setattr(module, "lookup_ip", lookup_ip)
+    monkeypatch.setattr(module, "check_abuseipdb", check_abuseipdb)
+    return module
+
+
+def test_batch_analyze_matches_legacy_shape(analyze_all):
+    results = [record.to_dict() for record in analyze_all.batch_analyze(ENTRIES)]
+
+    expected = [
+        legacy_result(TOR_IP, "443", "2025-01-01 03:15:00", "Brute Force", 100,
+                      True, False, False, *lookup_ip(TOR_IP)),
+        legacy_result("203.0.113.5", "3389", "2025-01-01 12:00:00", "Port Scan", 45,
+                      False, True, False, *lookup_ip("203.0.113.5")),
+        legacy_result("198.51.100.7", "8080", "bad-timestamp", "Brute Force", 75,
+                      False, False, True, *lookup_ip("198.51.100.7")),
+        legacy_result("192.0.2.9", "", "", "", 0,
+                      False, False, False, *lookup_ip("192.0.2.9")),
+    ]
+    assert len(results) == len(expected)
+    for result, legacy in zip(results, expected):
+        for key in legacy:
+            assert result[key] == legacy[key], key
+        assert set(result) == set(legacy)
+
+
+def test_batch_analyze_unknown_geolocation_scores_zero(analyze_all):
+    result = analyze_all.batch_analyze([{"ip": "192.0.2.9"}])[0].to_dict()
+    factors = {f["label"]: f["value"] for f in result["factor_scores"]}
+    assert result["geolocation"]["country"] == "Unknown"
+    assert factors["Geolocation"] == 0
+
+
+def test_to_dict_carries_port_and_history_scores():
+    # batch_analyze currently passes zeros; cover nonzero values directly.
+    geo_data, isp_data = lookup_ip(TOR_IP)
+    risk_result = calculate_risk_score(
+        abuse_score=100, blocklist_hit=True, tor_exit=True, vpn_detected=True,
+        proxy_detected=True, port_activity=80, history_score=40,
+    )
+    record = BatchRecord(
+        ip=TOR_IP, port="23", timestamp="2025-01-01 03:15:00", incident_type="Brute Force",
+        risk_result=risk_result, abuse_score=100, is_tor=True, vpn_detected=True,
+        proxy_detected=True, blocklist_hit=True, geo_data=geo_data, isp_data=isp_data,
+        port_activity=80, history_score=40,
+    )
+    legacy = legacy_result(TOR_IP, "23", "2025-01-01 03:15:00", "Brute Force", 100,
+                           True, True, True, *lookup_ip(TOR_IP),
+                           port_activity=80, history_score=40)
+    assert record.to_dict() == legacy